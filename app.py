@@ -1,60 +1,32 @@
 import streamlit as st   # import Streamlit library for building web apps
 import requests     # import the requests library for making HTTP requests
+import requests_cache    # import requests-cache for a persistent on-disk HTTP cache
+from requests.adapters import HTTPAdapter    # import HTTPAdapter for connection pooling
+from urllib3.util.retry import Retry    # import Retry for retrying failed requests
+import orjson    # import orjson for fast JSON parsing
+import numpy as np    # import numpy for numerical operations
 import pandas as pd    # import pandas for data manipulation and analysis
-from datetime import datetime, timedelta    # import datetime and timedelta for handling dates and times
-import plotly.express as px     # import Plotly Express for data visualization
-
-# Define event descriptions for glossary and explanations
-event_descriptions = {
-    "CME": "Coronal Mass Ejection (CME): A massive burst of solar wind and magnetic fields rising above the solar corona.",
-    "GST": "Geomagnetic Storm (GST): Disturbances in Earth's magnetosphere caused by solar wind shocks.",  # description for GST 
-    "FLR": "Solar Flare (FLR): A sudden flash of increased brightness on the Sun, usually observed near its surface.",  # description for FLR 
-    "SEP": "Solar Energetic Particle (SEP): High-energy particles emitted by the Sun, often associated with solar flares and CMEs.",  # description for SEP 
-    "IPS": "Interplanetary Shock (IPS): Shock waves traveling through space, often caused by CMEs or solar wind variations.",  # description for IPS 
-    "RBE": "Radiation Belt Enhancement (RBE): An increase in the density of charged particles in Earth's radiation belts.",  # description for RBE 
-    "MPC": "Magnetopause Crossing (MPC): When solar wind plasma crosses Earth's magnetopause, the boundary of the magnetosphere.",  # description for MPC 
-    "HSS": "High Speed Stream (HSS): Streams of fast-moving solar wind emanating from coronal holes on the Sun.",  # description for HSS 
-    "notifications": "Notifications: General alerts and updates related to various space weather events."    # description for notifications
-}
-
-# Define the CSS for space-themed design
-space_themed_css = """
-<style>
-
-/* background and text colors */
-body{
-    background-color: #0e1117;
-    color: #FAFAFA;
-    font-family: 'Arial', sans-serif;
-}
-
-.sidebar .sidebar-content{
-    background-color: #262730    /* set sidebar background color */
-    color: #FAFAFA;      /* set sidebard text color  */
-}
-
-/* remove the default streamlit header */
-.css-1d391kg{
-    background-color: #0e1117;     /* set background color of header  */
-}
-
-.css-1v3fcvr{
-    color: #FAFAFA;    /* set text color  */
-}
-
-.css-1adrfps.edgvbvh3{     /* targeting nested CSS classes */
-    background-color: #262730;
-}
-
-/* style for expander headers */
-.streamlit-expanderHeader{    /*  styling expander headers  */
-    color: #1f77b4;     /*  set color for expander headers  */
-} 
+import pyarrow as pa    # import pyarrow for Arrow tables
+import pyarrow.json as paj    # import the pyarrow JSON reader for bulk parsing
+import io    # import io to hand bytes to the pyarrow JSON reader
+from concurrent.futures import ThreadPoolExecutor, as_completed    # import thread pool helpers for concurrent requests
+from datetime import date, datetime, timedelta    # import date, datetime and timedelta for handling dates and times
+import plotly.graph_objects as go     # import Plotly graph objects for data visualization
+import plotly.io as pio     # import Plotly I/O to configure chart serialization
+from constants import (    # import the constants, which are built once per process rather than on every rerun
+    BIN_SIZES,
+    DATE_FIELD_MAPPING,
+    EVENT_DESCRIPTIONS,
+    EVENT_TYPES,
+    GLOSSARY_MARKDOWN,
+    PARAMS_TEMPLATE,
+    SPACE_THEMED_CSS,
+    Y_LABEL_MAPPING,
+)
 
-</style>
-"""    # end of CSS styles
+pio.json.config.default_engine = "orjson"   # serialize charts with orjson, which encodes numpy arrays without a per-element Python loop
 
-st.markdown(space_themed_css, unsafe_allow_html=True)   # apply the CSS styles to the Streamlit app
+st.markdown(SPACE_THEMED_CSS, unsafe_allow_html=True)   # apply the CSS styles to the Streamlit app
 
 # Title and Description
 st.title("🌌 Space Weather Visualizer")  # set the main title of the app
@@ -70,25 +42,15 @@ st.sidebar.header("Configuration")   # add a header to the sidebar
 api_key = st.sidebar.text_input("Enter your NASA API Key: ", value="DEMO_KEY")   # input field for NASA API Key
 
 # 2) Event Type Selection
-event_types = {    # dictionary mapping event display names to their codes
-    "CME (Coronal Mass Ejection)": "CME",  # mapping for CME 
-    "GST (Geomagnetic Storm)": "GST",  # mapping for GST 
-    "FLR (Solar Flare)": "FLR",  # mapping for FLR 
-    "SEP (Solar Energetic Particle)": "SEP",  # mapping for SEP 
-    "IPS (Interplanetary Shock)": "IPS",  # mapping for IPS 
-    "RBE (Radiation Belt Enhancement)": "RBE",  # mapping for RBE 
-    "MPC (Magnetopause Crossing)": "MPC",  # mapping for MPC 
-    "HSS (High Speed Stream)": "HSS",  # mapping for HSS 
-    "Notifications": "notifications"  # mapping for Notifications 
-}
-
 selected_event_display = st.sidebar.selectbox(   # dropdown for selecting event type
     "Select Space Weather Event Type: ",    # label for the dropdown 
-    list(event_types.keys()),   # list for event display names
+    list(EVENT_TYPES.keys()),   # list for event display names
     format_func = lambda x: x   # formatting function for display
 )
 
-api_endpoint = event_types[selected_event_display]   # get the selected event code
+api_endpoint = EVENT_TYPES[selected_event_display]   # get the selected event code
+
+fetch_all = st.sidebar.checkbox("Fetch all event types")   # checkbox to fetch every event type at once
 
 # 3) Date Range Selection
 st.sidebar.markdown('### Date Range')   # add a markdown header for date range
@@ -104,191 +66,312 @@ if start_date > end_date:   # check if start date is after end date
     
 # 4) Fetch Data Button
 fetch_button = st.sidebar.button("Fetch Data")  # button for fetching data from API
+if fetch_button:   # remember the query so the results stay on screen while the sidebar is edited
+    st.session_state["query"] = {
+        "event": api_endpoint,   # selected event code
+        "event_display": selected_event_display,   # selected event display name
+        "start": start_date.isoformat(),   # start of the date range as 'YYYY-MM-DD', a cheap and stable cache key
+        "end": end_date.isoformat(),   # end of the date range as 'YYYY-MM-DD'
+        "key": api_key,   # NASA API key
+        "fetch_all": fetch_all   # whether every event type was requested
+    }
 
 # 5) Event Information expandable section
 st.sidebar.markdown("### Event Information")    # add a markdown header for event info
 with st.sidebar.expander("ℹ️ What is this event?"):   # expander for event info
-    st.write(event_descriptions.get(api_endpoint, "No description available"))   # display selected event description
+    st.write(EVENT_DESCRIPTIONS.get(api_endpoint, "No description available"))   # display selected event description
     
 # 6) Glossary section
 st.sidebar.markdown("### Glossary")  # add a markdown header for glossary
 with st.sidebar.expander("📖 View Glossary"):   # expander for glossary terms
-    for term, description in event_descriptions.items():   # iterate over glossary terms
-        st.markdown(f"**{term}**: {description}")   # display each term and its corresponding description
+    st.markdown(GLOSSARY_MARKDOWN)   # display every term and its corresponding description
 
 # 7) Help section
 st.sidebar.markdown("### Help")    # add a markdown header for help section
 with st.sidebar.expander("❓ How to Use This App"):   # expander for help instructions
     st.write("""
     1. **Enter API Key**: Provide your NASA API Key.
-    2. **Select Event Type**: Choose the space weather event you're interested in.
+    2. **Select Event Type**: Choose the space weather event you're interested in, or tick "Fetch all event types".
     3. **Set Date Range**: Specify the start and end dates for the data visualization.
     4. **Fetch Data**: Click the "Fetch Data" button to retrieve and visualize the data.
     5. **View Details**: Expand the raw JSON data or raw data sections to inspect the data.
-    6. **Explore**: Interact with the plots to learn more about specific events.
+    6. **Explore**: Interact with the plots, or group the counts by day, week or month, to learn more about specific events.
     """)      # end of help instructions
     
-# Function to fetch data from NASA's DONKI API
-@st.cache_data(ttl = 3600)    # cache the function to avoid redundant API calls (stores info for some time)
-def fetch_space_weather(event, start, end, key):  # define function to fetch space weather data
+# Function to create a pooled HTTP session shared across reruns
+@st.cache_resource    # keep one session per process so keep-alive connections to api.nasa.gov are reused
+def _session():
+    session = requests_cache.CachedSession(   # session backed by an SQLite cache that survives restarts
+        "donki_cache.sqlite",   # cache file name
+        backend = "sqlite",   # store responses in SQLite
+        expire_after = 3600,   # recent responses expire after an hour, then are revalidated with ETag/Last-Modified
+        cache_control = True,   # honor Cache-Control headers sent by the server
+        stale_if_error = True   # fall back to a stale response if the API is unavailable
+    )
+    adapter = HTTPAdapter(    # connection pool with retries for transient errors
+        pool_connections = 4,   # number of host pools to cache
+        pool_maxsize = 8,   # max connections kept per host
+        max_retries = Retry(
+            total = 3,   # retry up to three times
+            backoff_factor = 0.3,   # wait 0.3s, 0.6s, 1.2s between attempts
+            status_forcelist = (429, 500, 502, 503, 504),   # retry on rate limiting and server errors
+            raise_on_status = False   # return the last response so its status code can be shown
+        )
+    )
+    session.mount("https://", adapter)   # use the adapter for all HTTPS requests
+    return session
+
+# Function to request one DONKI endpoint (makes no Streamlit calls so it can run in worker threads)
+def _request_donki(session, event, start, end, key):   # returns a (data, error message) pair
     base_url = f"https://api.nasa.gov/DONKI/{event}" 
     params = {    # initialize parameters for the API request
-        "startDate": start.strftime("%Y-%m-%d"),   # format start date
-        "endDate": end.strftime("%Y-%m-%d"),   # format end date
-        "api_key": key   # include the API key
-    }    
+        "startDate": start,   # start date, already formatted as 'YYYY-MM-DD'
+        "endDate": end,   # end date, already formatted as 'YYYY-MM-DD'
+        "api_key": key,   # include the API key
+        **PARAMS_TEMPLATE.get(event, {})   # additional parameters for specific events
+    }
     
-    # additional parameters for specific events
-    if event == "CME":    # check if the event is 'CME'
-        params.update({   # update parameters with CME-specific options
-            "mostAccurateOnly": "true",   # include only the most accurate data
-            "completeEntryOnly": "true",   # include only complete entries
-            "speed": 500,   # set speed parameter
-            "halfAngle": 30,   # set half-angle parameter
-            "catalog": "ALL"   # include all catalogs
-        })
-    elif event == "notifications":   # check if the event is notificaitons
-        params.update({    # update parameters for notifications
-            "type": "all"   # include all types of notifications
-        })
+    # archived date ranges don't change, so they can be cached on disk indefinitely
+    if date.fromisoformat(end) < datetime.utcnow().date() - timedelta(days = 2):   # check if the range ended more than two days ago
+        expire_after = requests_cache.NEVER_EXPIRE   # keep archived data forever
+    else:   # if the range includes recent days
+        expire_after = 3600   # keep recent data for an hour
     
-    response = requests.get(base_url, params = params)   # make the API request
+    try:
+        response = session.get(base_url, params = params, timeout = (3.05, 15), expire_after = expire_after)   # make the API request (connect, read timeouts)
+    except requests.exceptions.RequestException as e:   # if the request could not be completed
+        return None, f"Error fetching data: {e}"
     
     if response.status_code == 200:   # check if the request was successful
-        return response.json()   # return the JSON response
+        return orjson.loads(response.content), None   # parse and return the JSON response
     else:    # if the request failed
-        st.error(f"Error fetching data: {response.status_code} - {response.text}")  # display error message
-        return None
+        return None, f"Error fetching data: {response.status_code} - {response.text}"
+
+# Function to fetch data from NASA's DONKI API
+@st.cache_data(ttl = 3600)    # cache the function to avoid redundant API calls (stores info for some time)
+def fetch_space_weather(event, start, end, key):  # define function to fetch space weather data
+    data, error = _request_donki(_session(), event, start, end, key)   # make the API request
+    if error:   # if the request failed
+        st.error(error)  # display error message
+    return data
+
+# Function to fetch every event type at once
+@st.cache_data(ttl = 3600)    # cache the function to avoid redundant API calls (stores info for some time)
+def fetch_all_space_weather(start, end, key):   # returns a dict mapping event codes to their data
+    session = _session()   # share the pooled session between worker threads
+    results = {}
+    with ThreadPoolExecutor(max_workers = 8) as executor:   # the requests are I/O-bound, so threads overlap the round trips
+        futures = {    # submit one request per event type
+            executor.submit(_request_donki, session, event, start, end, key): event
+            for event in EVENT_TYPES.values()
+        }
+        for future in as_completed(futures):   # collect responses as they arrive
+            event = futures[future]   # event code for this response
+            data, error = future.result()
+            if error:   # if the request failed
+                st.error(f"{event}: {error}")   # display error message
+            results[event] = data
+    return {event: results[event] for event in EVENT_TYPES.values()}   # keep the sidebar order
+
+# Function to count events per day, week or month straight from the JSON records
+def _count_events(data, field, start, end, freq = "D"):   # freq is "D", "W" or "M"; avoids normalizing every nested column
+    days = np.array(   # the first ten characters of each timestamp, e.g. '2024-05-10T17:36Z', are the date
+        [record[field][:10] for record in data if record.get(field)],   # skip records without a timestamp
+        dtype = 'datetime64[D]'
+    )
+    ords = days.view('i8')   # int64 day numbers
+    lo, hi = np.array([start, end], dtype = 'datetime64[D]').view('i8')   # day numbers of the queried range
+    if ords.size:   # widen the range if any event falls outside it
+        lo, hi = min(lo, ords.min()), max(hi, ords.max())
     
-# proceed if Fetch Data button is clicked 
-if fetch_button:   
-    if not api_key:   # check if the API key is provided
-        st.error("Please enter your NASA API Key to proceed.")    # prompt user to enter API key
-    else:   # if API Key is provided
-        with st.spinner("Fetching data..."):   # show a spinner while fetching data
-            data = fetch_space_weather(api_endpoint, start_date, end_date, api_key)   # fetch the data
-            
-        if data:   # if data was fetched successfully
-            st.success("Data fetched successfully!")   # display success message
+    if freq == "D" or hi < lo:   # count per day
+        counts = np.bincount(ords - lo, minlength = max(hi - lo + 1, 0))   # index each day directly instead of sorting or hashing
+        return pd.DataFrame({"date": np.arange(lo, hi + 1).astype('datetime64[D]'), "count": counts})   # includes days without events
+    
+    # count per week or month
+    first, last = np.array([lo, hi]).astype('datetime64[D]')   # dates of the widened range
+    periods = pd.period_range(first, last, freq = freq)   # every week or month touching the range
+    edges = periods.start_time.append(pd.DatetimeIndex([(periods[-1] + 1).start_time]))   # bucket boundaries
+    pos = pd.DatetimeIndex(np.sort(days)).searchsorted(edges)   # locate every boundary in one vectorized call
+    return pd.DataFrame({"date": periods.start_time, "count": np.diff(pos)})   # events between consecutive boundaries
+    
+# Function to turn the JSON records into a flat DataFrame
+def _records_to_frame(data):   # parses in C++ with pyarrow instead of walking each record in Python
+    try:
+        table = paj.read_json(io.BytesIO(b"\n".join(orjson.dumps(record) for record in data)))   # the reader expects one JSON record per line
+    except pa.ArrowInvalid:   # if a field changes type between records
+        return pd.json_normalize(data)   # fall back to normalizing in Python
+    while any(pa.types.is_struct(field.type) for field in table.schema):   # flatten nested objects into 'parent.child' columns like json_normalize
+        table = table.flatten()
+    return table.to_pandas(types_mapper = pd.ArrowDtype)   # keep Arrow-backed columns
+
+# Function to downsample a line with Largest-Triangle-Three-Buckets (LTTB)
+def _lttb(x, y, n_out):   # returns the indices of the points to keep
+    n = len(x)
+    if n <= n_out or n_out < 3:   # nothing to downsample
+        return np.arange(n)
+    
+    x = x.astype(float)   # numeric x values, e.g. day numbers
+    y = y.astype(float)   # numeric y values
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)   # bucket boundaries; the first and last points are always kept
+    keep = np.empty(n_out, dtype = int)   # indices of the selected points
+    keep[0], keep[-1] = 0, n - 1
+    a = 0   # index of the previously selected point
+    for i in range(n_out - 2):   # pick one point per bucket
+        lo, hi = edges[i], edges[i + 1]   # current bucket
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n   # end of the next bucket
+        avg_x, avg_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()   # average point of the next bucket
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))   # triangle areas (times two)
+        a = lo + int(area.argmax())   # keep the point forming the largest triangle
+        keep[i + 1] = a
+    return keep
+
+# Function to draw a chart, reusing the figure kept in session state for this event
+def _draw_chart(event, kind, x, y, title, y_label, max_points = 1000):   # kind is either "line" or "bar"
+    fig_key = f"fig_{event}_{kind}"   # session state key for this event's figure
+    if fig_key not in st.session_state:   # build the figure only once per session
+        trace = go.Scattergl(mode = "lines+markers") if kind == "line" else go.Bar()   # create an empty trace (lines are drawn with WebGL)
+        st.session_state[fig_key] = go.Figure(trace, layout = {"template": "plotly_dark", "barmode": "overlay"})   # set the plot theme
+    
+    if kind == "line" and len(x) > max_points:   # long lines are more than the browser can draw smoothly
+        keep = _lttb(np.asarray(x, dtype = 'datetime64[D]').astype('int64'), np.asarray(y), max_points)   # downsample on day numbers
+        x, y = x[keep], y[keep]   # keep only the selected points
+    
+    fig = st.session_state[fig_key]   # get the existing figure
+    with fig.batch_update():   # apply all changes as a single update
+        fig.data[0].x = x   # replace the dates
+        fig.data[0].y = y   # replace the values
+        fig.data[0].hovertemplate = f"Date=%{{x}}<br>{y_label}=%{{y}}<extra></extra>"   # set the hover text
+        fig.update_layout(title = title, xaxis_title = "Date", yaxis_title = y_label,   # set the title and axis labels
+                          uirevision = event)   # keep zoom and pan state when the data changes
+    st.plotly_chart(fig, key = f"chart_{event}", use_container_width = True)   # a stable key lets Streamlit update the chart in place
+
+# Function to display the fetched data for one event type
+def display_event(event, event_display, data, start_date, end_date, freq):
+    if data:   # if data was fetched successfully
+        st.success("Data fetched successfully!")   # display success message
+        
+        # show raw JSON data for debugging
+        with st.expander("Show Raw JSON Data for Debugging"):   # expander to show raw JSON data
+            st.json(data)   # display the raw JSON data
+        
+        # process data based on event type
+        if isinstance(data, list):  # check if the data is a list
+            # define y_label
+            y_label = Y_LABEL_MAPPING.get(event, "Count")  # get the y-axis label based on the event type
             
-            # show raw JSON data for debugging
-            with st.expander("Show Raw JSON Data for Debugging"):   # expander to show raw JSON data
-                st.json(data)   # display the raw JSON data
+            # get the correct date field
+            date_field = DATE_FIELD_MAPPING.get(event, None)  # get the date field for the selected event
             
-            # process data based on event type
-            if isinstance(data, list):  # check if the data is a list
-                df = pd.json_normalize(data)  # normalize JSON data into a DataFrame
-                
-                # define date field mapping
-                date_field_mapping = {    # mapping of event types to their date fields
-                    "CME": "startTime",  # Date field for CME 
-                    "GST": "startTime",  # Date field for GST 
-                    "FLR": "beginTime",  # Date field for FLR 
-                    "SEP": "eventTime",  # Date field for SEP 
-                    "IPS": "eventTime",  # Date field for IPS 
-                    "RBE": "eventTime",  # Date field for RBE 
-                    "MPC": "eventTime",  # Date field for MPC 
-                    "HSS": "eventTime",  # Date field for HSS 
-                    "notifications": "messageIssueTime" 
-                }
-                
-                # define y_label mapping 
-                y_label_mapping = {   # mapping of event types to their y-axis labels
-                    "CME": "Number of CMEs",  # Y-label for CME 
-                    "GST": "Average Kp Index",  # Y-label for GST 
-                    "FLR": "Number of Solar Flares",  # Y-label for FLR 
-                    "SEP": "Number of Solar Energetic Particles",  # Y-label for SEP 
-                    "IPS": "Number of Interplanetary Shocks",  # Y-label for IPS 
-                    "RBE": "Number of Radiation Belt Enhancements",  # Y-label for RBE 
-                    "MPC": "Number of Magnetopause Crossings",  # Y-label for MPC 
-                    "HSS": "Number of High Speed Streams",  # Y-label for HSS 
-                    "notifications": "Number of Notifications" 
-                }
+            keys = list(dict.fromkeys(key for record in data for key in record))   # top-level keys present in the records
+            if not (date_field and date_field in keys):    # check if the date field exists in the data
+                # attempt to find a date field dynamically
+                possible_keys = [key for key in keys if 'date' in key.lower() or 'time' in key.lower()]  # search for keys containing 'date' or 'time'
+                if possible_keys:  # if any possible date fields are found
+                    date_field = possible_keys[0]  # use the first possible date field
+                    st.warning(f"Using '{date_field}' as the date field")   # warn the user about the chosen date field
+                else:  # if no date fields are found
+                    st.error("No suitable date field found in the data")  # display error message
+                    date_field = None   # nothing to count by
+                    
+            # handle different event types
+            if event == "CME":   # if the event is CME
+                # for CME, plot the no. of CMEs per day
+                df_grouped = _count_events(data, date_field, start_date, end_date, freq)  # count CMEs per day, week or month
                 
-                # define y_label
-                y_label = y_label_mapping.get(api_endpoint, "Count")  # get the y-axis label based on the event type
+                # plotting with Plotly for interactivity
+                st.markdown("### Selected Event Information")   # add a markdown header
+                st.write(EVENT_DESCRIPTIONS.get(event, "No description available."))   # display event description
                 
-                # get the correct date field
-                date_field = date_field_mapping.get(api_endpoint, None)  # get the date field for the selected event
+                st.subheader(f"{event_display} from {start_date} to {end_date}")   # add a subheader with event and date range
+                _draw_chart(event, "line", df_grouped['date'].to_numpy(), df_grouped['count'].to_numpy(),   # draw a line plot for CME trend
+                            f"Trend of {event_display} Over Time", y_label)
                 
-                if date_field and date_field in df.columns:    # check if the date field exists in the DataFrame
-                    df['date'] = pd.to_datetime(df[date_field], errors = 'coerce').dt.date   # convert the date field to datetime and extract the date
-                else:   # if the specific date field is not found
-                    # attempt to find a date field dynamically
-                    possible_keys = [col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()]  # search for columns containing 'date' or 'time'
-                    if possible_keys:  # if any possible date fields are found
-                        date_field = possible_keys[0]  # use the first possible date field
-                        st.warning(f"Using '{date_field}' as the date field")   # warn the user about the chosen date field
-                        df['date'] = pd.to_datetime(df[date_field], errors = 'coerce').dt.date  # convert to datetime and extract the date
-                    else:  # if no date fields are found
-                        st.error("No suitable date field found in the data")  # display error message
-                        df['date'] = pd.NaT   # assign Not-a-Time if no date field is found
-                        
-                # handle different event types
-                if api_endpoint == "CME":   # if the event is CME
-                    # for CME, plot the no. of CMEs per day
-                    df_grouped = df.groupby('date').size().reset_index(name = 'count')  # group data by date and count CMEs
+            elif event == 'GST':   # if the event is GST
+                # for GST, plot the average Kp index per day
+                records = [    # one (date, Kp index) pair per observation
+                    (kp["observedTime"][:10], kp["kpIndex"])
+                    for row in data for kp in (row.get("allKpIndex") or [])
+                    if kp.get("observedTime")
+                ]
+                if records:    # check if any 'allKpIndex' observations exist
+                    kp_df = pd.DataFrame.from_records(records, columns = ["date", "kpIndex"])   # build the Kp DataFrame in one step
+                    kp_df['date'] = kp_df['date'].astype('category')   # group on category codes rather than strings
+                    df_grouped = kp_df.groupby('date', observed = True)['kpIndex'].mean().reset_index()    # calculate avg Kp Index per day
                     
                     # plotting with Plotly for interactivity
                     st.markdown("### Selected Event Information")   # add a markdown header
-                    st.write(event_descriptions.get(api_endpoint, "No description available."))   # display event description
-                    
-                    st.subheader(f"{selected_event_display} from {start_date} to {end_date}")   # add a subheader with event and date range
-                    fig = px.line(df_grouped, x = 'date', y = 'count', title = f"Trend of {selected_event_display} Over Time",  # create a line plot for CME trend
-                                labels = {"date": "Date", "count": label},    # set axis labels
-                                markers = True, template = "plotly_dark")  # add markers and set theme
-                    st.plotly_chart(fig, use_container_width = True)   # display the plotly chart
+                    st.write(EVENT_DESCRIPTIONS.get(event, "No description available"))    # display event description
                     
-                elif api_endpoint == 'GST':   # if the event is GST
-                    # for GST, plot the average Kp index per day
-                    if 'allKpIndex' in df.columns:    # check if 'allKpIndex' column exists
-                        kp_df = df.explode('allKpIndex')   # explore the 'allKpIndex' list into separate rows
-                        kp_df = pd.json_normalize(kp_df['allKpIndex'])   # normalize the exploded JSON data
-                        kp_df['date'] = pd.to_datetime(kp_df['observedTime'], errors = 'coerce').dt.date  # convert 'observedTime' to date
-                        df_grouped = kp_df.groupby('date').agg({'kpIndex': 'mean'}).reset_index()    # calculate avg Kp Index per day
-                        
-                        # plotting with Plotly for interactivity
-                        st.markdown("### Selected Event Information")   # add a markdown header
-                        st.write(event_descriptions.get(api_endpoint, "No description available"))    # display event description
-                        
-                        st.subheader(f"{selected_event_display} Kp Index from {start_date} to {end_date}")   # add a subheader with event and date range
-                        fig = px.line(df_grouped, x = 'date', y = 'kpIndex', title = f"Average Kp Index of {selected_event_display} Over Time",   # create a line plot for average kp Index
-                                labels = {"date": "Date", "kpIndex": y_label},    # set axis labels
-                                markers = True, template = "plotly_dark")   # add markers and set theme
-                        st.plotly_chart(fig, use_container_width = True)   # display the plotly chart
-                    else:  # if 'allKpIndex' data is not available
-                        st.error("No 'allKpIndex' data available to plot.")   # show error message
-                        
-                elif api_endpoint == "notifications":    # if event is 'notifications'
-                    # for notifications, plot the no. of notifications per day
-                    df_grouped = df.groupby('date').size().reset_index(name = 'count')  # group data by date and count notifications
-                    
-                    # plotting with Plotly for interactivity
-                    st.markdown("### Selected Event Information")  # add a markdown header
-                    st.write(event_descriptions.get(api_endpoint, "No description available."))   # display event description
-                    
-                    st.subheader(f"{selected_event_display} from {start_date} to {end_date}")    # add a subheader with event and date range
-                    fig = px.bar(df_grouped, x = 'date', y = 'count', title = f"Number of {selected_event_display} Over Time",   # create a bar chart for notifications
-                                labels = {"date": "Date", "count": y_label},    # set axis labels
-                                template = "plotly_dark")   # set the plot theme
-                    st.plotly_chart(fig, use_container_width = True)    # display the plotly chart
-                    
-                else:   # for other event types
-                    # plot the count per day
-                    df_grouped = df.groupby('date').size().reset_index(name = 'count')   # group data by date and time
-                    
-                    # plotting with Plotly for interactivity
-                    st.markdown("### Selected Event Information")   # add a markdown header
-                    st.write(event_descriptions.get(api_endpoint, "No description available."))    # display event description
+                    st.subheader(f"{event_display} Kp Index from {start_date} to {end_date}")   # add a subheader with event and date range
+                    _draw_chart(event, "line", df_grouped['date'].to_numpy(), df_grouped['kpIndex'].to_numpy(),   # draw a line plot for average kp Index
+                                f"Average Kp Index of {event_display} Over Time", y_label)
+                else:  # if 'allKpIndex' data is not available
+                    st.error("No 'allKpIndex' data available to plot.")   # show error message
                     
-                    st.subheader(f"{selected_event_display} from {start_date} to {end_date}")   # add a subheader with event and date range
-                    fig = px.bar(df_grouped, x = 'date', y = 'count', title = f"Number of {selected_event_display} Over Time",    # create a bar chart for event counts 
-                                labels = {"date": "Date", "count": y_label},    # set axis labels
-                                template = "plotly_dark")    # set the plot theme
-                    st.plotly_chart(fig, use_container_width = True)   # display the plotly chart
-                    
-                # show raw data
-                with st.expander("Show Raw Data"):   # expander to show the raw DataFrame
-                    st.write(df)   # display the raw DataFrame
-            else:   # if no data is available
-                st.write("No data available for the selected parameters.")    # inform the user that no data is available
\ No newline at end of file
+            elif event == "notifications":    # if event is 'notifications'
+                # for notifications, plot the no. of notifications per day
+                df_grouped = _count_events(data, date_field, start_date, end_date, freq)  # count notifications per day, week or month
+                
+                # plotting with Plotly for interactivity
+                st.markdown("### Selected Event Information")  # add a markdown header
+                st.write(EVENT_DESCRIPTIONS.get(event, "No description available."))   # display event description
+                
+                st.subheader(f"{event_display} from {start_date} to {end_date}")    # add a subheader with event and date range
+                _draw_chart(event, "bar", df_grouped['date'].to_numpy(), df_grouped['count'].to_numpy(),   # draw a bar chart for notifications
+                            f"Number of {event_display} Over Time", y_label)
+                
+            else:   # for other event types
+                # plot the count per day
+                df_grouped = _count_events(data, date_field, start_date, end_date, freq)   # count events per day, week or month
+                
+                # plotting with Plotly for interactivity
+                st.markdown("### Selected Event Information")   # add a markdown header
+                st.write(EVENT_DESCRIPTIONS.get(event, "No description available."))    # display event description
+                
+                st.subheader(f"{event_display} from {start_date} to {end_date}")   # add a subheader with event and date range
+                _draw_chart(event, "bar", df_grouped['date'].to_numpy(), df_grouped['count'].to_numpy(),   # draw a bar chart for event counts
+                            f"Number of {event_display} Over Time", y_label)
+                
+            # show raw data
+            with st.expander("Show Raw Data"):   # expander to show the raw DataFrame
+                preview_cols = [col for col in [date_field, "sourceLocation", "activeRegionNum"] if col in keys]   # small subset of useful columns
+                if st.checkbox("Show all columns", key = f"all_columns_{event}") or not preview_cols:   # the full table can be several MB
+                    df = _records_to_frame(data)  # build the full DataFrame
+                else:   # show a preview only
+                    df = pd.DataFrame(data[:500], columns = preview_cols)   # first 500 records, selected columns only
+                if date_field in df.columns:    # check if the date field exists in the DataFrame
+                    df.insert(0, 'date', pd.to_datetime(df[date_field], format = 'ISO8601', errors = 'coerce', utc = True, cache = True).values.astype('datetime64[D]'))   # convert the date field to datetime and truncate to the day
+                st.dataframe(df)   # display the DataFrame
+                st.download_button("Download full JSON", orjson.dumps(data), f"donki_{event}.json",   # offer the complete data as a file instead
+                                   mime = "application/json", key = f"download_{event}")
+        else:   # if no data is available
+            st.write("No data available for the selected parameters.")    # inform the user that no data is available
+
+# Function to fetch and display the data for the last submitted query
+@st.fragment   # isolate the plot area so reruns triggered inside it don't rerun the whole script
+def render_results():
+    query = st.session_state.get("query")   # get the last submitted query
+    if query is None:   # proceed only once Fetch Data has been clicked
+        return
+    
+    bin_size = st.radio("Group counts by", list(BIN_SIZES.keys()), horizontal = True)   # changing this only reruns the fragment
+    freq = BIN_SIZES[bin_size]   # get the selected bin frequency
+    
+    if not query["key"]:   # check if the API key is provided
+        st.error("Please enter your NASA API Key to proceed.")    # prompt user to enter API key
+    elif query["fetch_all"]:   # if all event types were requested
+        with st.spinner("Fetching data for all event types..."):   # show a spinner while fetching data
+            all_data = fetch_all_space_weather(query["start"], query["end"], query["key"])   # fetch every event type concurrently
+        
+        tabs = st.tabs(list(EVENT_TYPES.keys()))   # one tab per event type
+        for tab, (event_display, event) in zip(tabs, EVENT_TYPES.items()):   # iterate over the event types
+            with tab:
+                display_event(event, event_display, all_data[event], query["start"], query["end"], freq)   # display the data for this event
+    else:   # if API Key is provided
+        with st.spinner("Fetching data..."):   # show a spinner while fetching data
+            data = fetch_space_weather(query["event"], query["start"], query["end"], query["key"])   # fetch the data
+        
+        display_event(query["event"], query["event_display"], data, query["start"], query["end"], freq)   # display the data
+
+render_results()
@@ -0,0 +1,114 @@
+from types import MappingProxyType   # import MappingProxyType for read-only dictionaries
+
+# Define event descriptions for glossary and explanations
+EVENT_DESCRIPTIONS = MappingProxyType({
+    "CME": "Coronal Mass Ejection (CME): A massive burst of solar wind and magnetic fields rising above the solar corona.",
+    "GST": "Geomagnetic Storm (GST): Disturbances in Earth's magnetosphere caused by solar wind shocks.",  # description for GST 
+    "FLR": "Solar Flare (FLR): A sudden flash of increased brightness on the Sun, usually observed near its surface.",  # description for FLR 
+    "SEP": "Solar Energetic Particle (SEP): High-energy particles emitted by the Sun, often associated with solar flares and CMEs.",  # description for SEP 
+    "IPS": "Interplanetary Shock (IPS): Shock waves traveling through space, often caused by CMEs or solar wind variations.",  # description for IPS 
+    "RBE": "Radiation Belt Enhancement (RBE): An increase in the density of charged particles in Earth's radiation belts.",  # description for RBE 
+    "MPC": "Magnetopause Crossing (MPC): When solar wind plasma crosses Earth's magnetopause, the boundary of the magnetosphere.",  # description for MPC 
+    "HSS": "High Speed Stream (HSS): Streams of fast-moving solar wind emanating from coronal holes on the Sun.",  # description for HSS 
+    "notifications": "Notifications: General alerts and updates related to various space weather events."    # description for notifications
+})
+
+# Build the glossary text once so it can be sent as a single markdown element
+GLOSSARY_MARKDOWN = "\n\n".join(f"**{term}**: {description}" for term, description in EVENT_DESCRIPTIONS.items())
+
+# Define the CSS for space-themed design
+SPACE_THEMED_CSS = """
+<style>
+
+/* background and text colors */
+body{
+    background-color: #0e1117;
+    color: #FAFAFA;
+    font-family: 'Arial', sans-serif;
+}
+
+.sidebar .sidebar-content{
+    background-color: #262730    /* set sidebar background color */
+    color: #FAFAFA;      /* set sidebard text color  */
+}
+
+/* remove the default streamlit header */
+.css-1d391kg{
+    background-color: #0e1117;     /* set background color of header  */
+}
+
+.css-1v3fcvr{
+    color: #FAFAFA;    /* set text color  */
+}
+
+.css-1adrfps.edgvbvh3{     /* targeting nested CSS classes */
+    background-color: #262730;
+}
+
+/* style for expander headers */
+.streamlit-expanderHeader{    /*  styling expander headers  */
+    color: #1f77b4;     /*  set color for expander headers  */
+} 
+
+</style>
+"""    # end of CSS styles
+
+# Define the event types offered in the sidebar
+EVENT_TYPES = MappingProxyType({    # dictionary mapping event display names to their codes
+    "CME (Coronal Mass Ejection)": "CME",  # mapping for CME 
+    "GST (Geomagnetic Storm)": "GST",  # mapping for GST 
+    "FLR (Solar Flare)": "FLR",  # mapping for FLR 
+    "SEP (Solar Energetic Particle)": "SEP",  # mapping for SEP 
+    "IPS (Interplanetary Shock)": "IPS",  # mapping for IPS 
+    "RBE (Radiation Belt Enhancement)": "RBE",  # mapping for RBE 
+    "MPC (Magnetopause Crossing)": "MPC",  # mapping for MPC 
+    "HSS (High Speed Stream)": "HSS",  # mapping for HSS 
+    "Notifications": "notifications"  # mapping for Notifications 
+})
+
+# Define the date field of each event type
+DATE_FIELD_MAPPING = MappingProxyType({    # mapping of event types to their date fields
+    "CME": "startTime",  # Date field for CME 
+    "GST": "startTime",  # Date field for GST 
+    "FLR": "beginTime",  # Date field for FLR 
+    "SEP": "eventTime",  # Date field for SEP 
+    "IPS": "eventTime",  # Date field for IPS 
+    "RBE": "eventTime",  # Date field for RBE 
+    "MPC": "eventTime",  # Date field for MPC 
+    "HSS": "eventTime",  # Date field for HSS 
+    "notifications": "messageIssueTime" 
+})
+
+# Define the y-axis label of each event type
+Y_LABEL_MAPPING = MappingProxyType({   # mapping of event types to their y-axis labels
+    "CME": "Number of CMEs",  # Y-label for CME 
+    "GST": "Average Kp Index",  # Y-label for GST 
+    "FLR": "Number of Solar Flares",  # Y-label for FLR 
+    "SEP": "Number of Solar Energetic Particles",  # Y-label for SEP 
+    "IPS": "Number of Interplanetary Shocks",  # Y-label for IPS 
+    "RBE": "Number of Radiation Belt Enhancements",  # Y-label for RBE 
+    "MPC": "Number of Magnetopause Crossings",  # Y-label for MPC 
+    "HSS": "Number of High Speed Streams",  # Y-label for HSS 
+    "notifications": "Number of Notifications" 
+})
+
+# Define the extra API parameters for specific events
+PARAMS_TEMPLATE = MappingProxyType({
+    "CME": MappingProxyType({   # CME-specific options
+        "mostAccurateOnly": "true",   # include only the most accurate data
+        "completeEntryOnly": "true",   # include only complete entries
+        "speed": "500",   # set speed parameter
+        "halfAngle": "30",   # set half-angle parameter
+        "catalog": "ALL"   # include all catalogs
+    }),
+    "notifications": MappingProxyType({   # parameters for notifications
+        "type": "all"   # include all types of notifications
+    })
+})
+
+# Define the bin sizes offered for event counts
+BIN_SIZES = MappingProxyType({
+    "Day": "D",   # count per day
+    "Week": "W",   # count per week (Monday to Sunday)
+    "Month": "M"   # count per calendar month
+})